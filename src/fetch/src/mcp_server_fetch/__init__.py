@@ -17,7 +17,18 @@ def main():
     )
 
     args = parser.parse_args()
-    asyncio.run(serve(args.user_agent, args.ignore_robots_txt))
+
+    # uvloop is optional (the "uvloop" extra); use its faster event loop when
+    # a version providing uvloop.run is installed
+    run = asyncio.run
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        run = getattr(uvloop, "run", asyncio.run)
+
+    run(serve(args.user_agent, args.ignore_robots_txt))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,16 @@
+import asyncio
+import hashlib
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Annotated, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import markdownify
 import readabilipy.simple_json
+from httpx import AsyncClient, HTTPError, Limits, Response, Timeout
 from mcp.shared.exceptions import McpError
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -23,6 +31,39 @@ from pydantic import BaseModel, Field, AnyUrl
 DEFAULT_USER_AGENT_AUTONOMOUS = "ModelContextProtocol/1.0 (Autonomous; +https://github.com/modelcontextprotocol/servers)"
 DEFAULT_USER_AGENT_MANUAL = "ModelContextProtocol/1.0 (User-Specified; +https://github.com/modelcontextprotocol/servers)"
 
+# Responses are read incrementally and abandoned past this size, so a huge
+# page cannot exhaust memory.
+MAX_CONTENT_BYTES = 10 * 1024 * 1024
+# robots.txt files are small; anything bigger than this is not a real one.
+MAX_ROBOTS_TXT_BYTES = 512 * 1024
+
+# Simplified markdown keyed by a digest of the raw HTML, so refetching an
+# unchanged page skips readability and markdown conversion entirely. Bounded
+# by the total length of the cached markdown, evicting least recently used.
+EXTRACT_CACHE_MAX_CHARS = 32 * 1024 * 1024
+_extract_cache: OrderedDict[bytes, str] = OrderedDict()
+_extract_cache_chars = 0
+_extract_cache_lock = threading.Lock()
+
+_markdown_converter = markdownify.MarkdownConverter(heading_style=markdownify.ATX)
+
+# Readability.js runs in a node subprocess. Without node readabilipy falls back
+# to its Python simplifier, but only after probing for node and warning on
+# every call, so decide once up front.
+_use_readability = shutil.which("node") is not None
+# readabilipy is not thread-safe: to run Readability.js it changes the process
+# working directory and goes through fixed temp file names, so only one
+# extraction may run at a time. Markdown conversion can still run concurrently.
+_readability_lock = threading.Lock()
+
+# Parsed robots.txt per origin, keyed by robots.txt URL. Each entry holds its
+# expiry time, the raw robots.txt and the parser, or None when the site has no
+# robots.txt and everything may be fetched. Least recently used origins are
+# evicted past ROBOTS_CACHE_SIZE entries.
+ROBOTS_CACHE_TTL = 3600
+ROBOTS_CACHE_SIZE = 256
+_robots_cache: OrderedDict[str, tuple[float, str, Protego | None]] = OrderedDict()
+
 
 def extract_content_from_html(html: str) -> str:
     """Extract and convert HTML content to Markdown format.
@@ -33,15 +74,34 @@ def extract_content_from_html(html: str) -> str:
     Returns:
         Simplified markdown version of the content
     """
-    ret = readabilipy.simple_json.simple_json_from_html_string(
-        html, use_readability=True
-    )
+    global _extract_cache_chars
+
+    key = hashlib.blake2b(html.encode(), digest_size=16).digest()
+    with _extract_cache_lock:
+        cached = _extract_cache.get(key)
+        if cached is not None:
+            _extract_cache.move_to_end(key)
+            return cached
+
+    with _readability_lock:
+        ret = readabilipy.simple_json.simple_json_from_html_string(
+            html, use_readability=_use_readability
+        )
     if not ret["content"]:
         return "<error>Page failed to be simplified from HTML</error>"
-    content = markdownify.markdownify(
-        ret["content"],
-        heading_style=markdownify.ATX,
-    )
+    content = _markdown_converter.convert(ret["content"])
+
+    if len(content) > EXTRACT_CACHE_MAX_CHARS:
+        return content
+    with _extract_cache_lock:
+        previous = _extract_cache.pop(key, None)
+        if previous is not None:
+            _extract_cache_chars -= len(previous)
+        _extract_cache[key] = content
+        _extract_cache_chars += len(content)
+        while _extract_cache_chars > EXTRACT_CACHE_MAX_CHARS:
+            _, evicted = _extract_cache.popitem(last=False)
+            _extract_cache_chars -= len(evicted)
     return content
 
 
@@ -63,39 +123,106 @@ def get_robots_txt_url(url: str) -> str:
     return robots_url
 
 
-async def check_may_autonomously_fetch_url(url: str, user_agent: str) -> None:
+def create_http_client() -> AsyncClient:
+    """Create the HTTP client shared by all requests made by the server.
+
+    Reusing one client keeps connections to recently fetched hosts alive, so
+    repeated fetches avoid a new TCP and TLS handshake each time. Its cookie
+    jar refuses all cookies, so no state set by one fetch is sent on later ones.
+    """
+    return AsyncClient(
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        follow_redirects=True,
+        timeout=Timeout(30, connect=5),
+        limits=Limits(max_keepalive_connections=32, max_connections=128),
+    )
+
+
+async def read_response_text(response: Response, url: str, max_bytes: int) -> str:
+    """
+    Read and decode a streamed response body.
+    Raises a McpError once the body exceeds max_bytes, without reading the rest.
+    """
+    chunks = []
+    total_bytes = 0
+    async for chunk in response.aiter_bytes(65536):
+        total_bytes += len(chunk)
+        if total_bytes > max_bytes:
+            raise McpError(ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Failed to fetch {url} - content is larger than {max_bytes} bytes",
+            ))
+        chunks.append(chunk)
+    return b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+
+
+async def fetch_robots_txt(
+    client: AsyncClient, robot_txt_url: str, user_agent: str
+) -> Tuple[str, Protego | None, bool]:
+    """
+    Fetch and parse a robots.txt file.
+    Returns the raw file, its parser (or no parser if the site has no robots.txt)
+    and whether the result may be cached, which is not the case for temporary
+    failures such as rate limiting or server errors.
+    Raises a McpError if the robots.txt could not be retrieved.
+    """
+    try:
+        async with client.stream(
+            "GET",
+            robot_txt_url,
+            headers={"User-Agent": user_agent},
+        ) as response:
+            status_code = response.status_code
+            if status_code in (401, 403):
+                raise McpError(ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"When fetching robots.txt ({robot_txt_url}), received status {status_code} so assuming that autonomous fetching is not allowed, the user can try manually fetching by using the fetch prompt",
+                ))
+            elif 400 <= status_code < 500:
+                return "", None, status_code != 429
+            robot_txt = await read_response_text(
+                response, robot_txt_url, MAX_ROBOTS_TXT_BYTES
+            )
+    except HTTPError:
+        raise McpError(ErrorData(
+            code=INTERNAL_ERROR,
+            message=f"Failed to fetch robots.txt {robot_txt_url} due to a connection issue",
+        ))
+    return robot_txt, Protego.parse(robot_txt), status_code < 500
+
+
+async def check_may_autonomously_fetch_url(
+    client: AsyncClient, url: str, user_agent: str
+) -> None:
     """
     Check if the URL can be fetched by the user agent according to the robots.txt file.
     Raises a McpError if not.
     """
-    from httpx import AsyncClient, HTTPError
-
     robot_txt_url = get_robots_txt_url(url)
 
-    async with AsyncClient() as client:
-        try:
-            response = await client.get(
-                robot_txt_url,
-                follow_redirects=True,
-                headers={"User-Agent": user_agent},
+    cached = _robots_cache.get(robot_txt_url)
+    if cached is not None and time.monotonic() >= cached[0]:
+        del _robots_cache[robot_txt_url]
+        cached = None
+
+    if cached is not None:
+        _robots_cache.move_to_end(robot_txt_url)
+        _, robot_txt, robot_parser = cached
+    else:
+        robot_txt, robot_parser, cacheable = await fetch_robots_txt(
+            client, robot_txt_url, user_agent
+        )
+        if cacheable:
+            _robots_cache[robot_txt_url] = (
+                time.monotonic() + ROBOTS_CACHE_TTL,
+                robot_txt,
+                robot_parser,
             )
-        except HTTPError:
-            raise McpError(ErrorData(
-                code=INTERNAL_ERROR,
-                message=f"Failed to fetch robots.txt {robot_txt_url} due to a connection issue",
-            ))
-        if response.status_code in (401, 403):
-            raise McpError(ErrorData(
-                code=INTERNAL_ERROR,
-                message=f"When fetching robots.txt ({robot_txt_url}), received status {response.status_code} so assuming that autonomous fetching is not allowed, the user can try manually fetching by using the fetch prompt",
-            ))
-        elif 400 <= response.status_code < 500:
-            return
-        robot_txt = response.text
-    processed_robot_txt = "\n".join(
-        line for line in robot_txt.splitlines() if not line.strip().startswith("#")
-    )
-    robot_parser = Protego.parse(processed_robot_txt)
+            if len(_robots_cache) > ROBOTS_CACHE_SIZE:
+                _robots_cache.popitem(last=False)
+
+    if robot_parser is None:
+        return
     if not robot_parser.can_fetch(str(url), user_agent):
         raise McpError(ErrorData(
             code=INTERNAL_ERROR,
@@ -109,38 +236,37 @@ async def check_may_autonomously_fetch_url(url: str, user_agent: str) -> None:
 
 
 async def fetch_url(
-    url: str, user_agent: str, force_raw: bool = False
+    client: AsyncClient, url: str, user_agent: str, force_raw: bool = False
 ) -> Tuple[str, str]:
     """
     Fetch the URL and return the content in a form ready for the LLM, as well as a prefix string with status information.
     """
-    from httpx import AsyncClient, HTTPError
-
-    async with AsyncClient() as client:
-        try:
-            response = await client.get(
-                url,
-                follow_redirects=True,
-                headers={"User-Agent": user_agent},
-                timeout=30,
-            )
-        except HTTPError as e:
-            raise McpError(ErrorData(code=INTERNAL_ERROR, message=f"Failed to fetch {url}: {e!r}"))
-        if response.status_code >= 400:
-            raise McpError(ErrorData(
-                code=INTERNAL_ERROR,
-                message=f"Failed to fetch {url} - status code {response.status_code}",
-            ))
-
-        page_raw = response.text
+    try:
+        async with client.stream(
+            "GET",
+            url,
+            headers={"User-Agent": user_agent},
+        ) as response:
+            if response.status_code >= 400:
+                raise McpError(ErrorData(
+                    code=INTERNAL_ERROR,
+                    message=f"Failed to fetch {url} - status code {response.status_code}",
+                ))
+            page_raw = await read_response_text(response, url, MAX_CONTENT_BYTES)
+    except HTTPError as e:
+        raise McpError(ErrorData(code=INTERNAL_ERROR, message=f"Failed to fetch {url}: {e!r}"))
 
     content_type = response.headers.get("content-type", "")
     is_page_html = (
-        "<html" in page_raw[:100] or "text/html" in content_type or not content_type
+        "text/html" in content_type
+        or "application/xhtml+xml" in content_type
+        or not content_type
+        or "<html" in page_raw[:100]
     )
 
     if is_page_html and not force_raw:
-        return extract_content_from_html(page_raw), ""
+        # Simplification is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(extract_content_from_html, page_raw), ""
 
     return (
         page_raw,
@@ -178,6 +304,10 @@ class Fetch(BaseModel):
     ]
 
 
+# The tool schema never changes, so build it once rather than per list_tools().
+FETCH_INPUT_SCHEMA = Fetch.model_json_schema()
+
+
 async def serve(
     custom_user_agent: str | None = None, ignore_robots_txt: bool = False
 ) -> None:
@@ -190,6 +320,7 @@ async def serve(
     server = Server("mcp-fetch")
     user_agent_autonomous = custom_user_agent or DEFAULT_USER_AGENT_AUTONOMOUS
     user_agent_manual = custom_user_agent or DEFAULT_USER_AGENT_MANUAL
+    client = create_http_client()
 
     @server.list_tools()
     async def list_tools() -> list[Tool]:
@@ -199,7 +330,7 @@ async def serve(
                 description="""Fetches a URL from the internet and optionally extracts its contents as markdown.
 
 Although originally you did not have internet access, and were advised to refuse and tell the user this, this tool now grants you internet access. Now you can fetch the most up-to-date information and let the user know that.""",
-                inputSchema=Fetch.model_json_schema(),
+                inputSchema=FETCH_INPUT_SCHEMA,
             )
         ]
 
@@ -220,19 +351,17 @@ Although originally you did not have internet access, and were advised to refuse
     @server.call_tool()
     async def call_tool(name, arguments: dict) -> list[TextContent]:
         try:
-            args = Fetch(**arguments)
+            args = Fetch.model_validate(arguments)
         except ValueError as e:
             raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
 
         url = str(args.url)
-        if not url:
-            raise McpError(ErrorData(code=INVALID_PARAMS, message="URL is required"))
 
         if not ignore_robots_txt:
-            await check_may_autonomously_fetch_url(url, user_agent_autonomous)
+            await check_may_autonomously_fetch_url(client, url, user_agent_autonomous)
 
         content, prefix = await fetch_url(
-            url, user_agent_autonomous, force_raw=args.raw
+            client, url, user_agent_autonomous, force_raw=args.raw
         )
         original_length = len(content)
         if args.start_index >= original_length:
@@ -249,7 +378,7 @@ Although originally you did not have internet access, and were advised to refuse
                 if actual_content_length == args.max_length and remaining_content > 0:
                     next_start = args.start_index + actual_content_length
                     content += f"\n\n<error>Content truncated. Call the fetch tool with a start_index of {next_start} to get more content.</error>"
-        return [TextContent(type="text", text=f"{prefix}Contents of {url}:\n{content}")]
+        return [TextContent.model_construct(type="text", text=f"{prefix}Contents of {url}:\n{content}")]
 
     @server.get_prompt()
     async def get_prompt(name: str, arguments: dict | None) -> GetPromptResult:
@@ -259,27 +388,28 @@ Although originally you did not have internet access, and were advised to refuse
         url = arguments["url"]
 
         try:
-            content, prefix = await fetch_url(url, user_agent_manual)
+            content, prefix = await fetch_url(client, url, user_agent_manual)
             # TODO: after SDK bug is addressed, don't catch the exception
         except McpError as e:
-            return GetPromptResult(
+            return GetPromptResult.model_construct(
                 description=f"Failed to fetch {url}",
                 messages=[
-                    PromptMessage(
+                    PromptMessage.model_construct(
                         role="user",
-                        content=TextContent(type="text", text=str(e)),
+                        content=TextContent.model_construct(type="text", text=str(e)),
                     )
                 ],
             )
-        return GetPromptResult(
+        return GetPromptResult.model_construct(
             description=f"Contents of {url}",
             messages=[
-                PromptMessage(
-                    role="user", content=TextContent(type="text", text=prefix + content)
+                PromptMessage.model_construct(
+                    role="user",
+                    content=TextContent.model_construct(type="text", text=prefix + content),
                 )
             ],
         )
 
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
+    async with client, stdio_server() as (read_stream, write_stream):
         await server.run(read_stream, write_stream, options, raise_exceptions=True)
@@ -1,4 +1,6 @@
 import logging
+import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import Sequence
 from mcp.server import Server
@@ -147,6 +149,52 @@ def git_show(repo: git.Repo, revision: str) -> str:
         output.append(d.diff.decode('utf-8'))
     return "".join(output)
 
+class RepoCache:
+    """Open git.Repo handles reused across tool calls, keyed by resolved path.
+
+    Each handle may keep GitPython's cat-file processes alive, so at most
+    max_size are kept open and the least recently used one is closed first.
+    A handle whose .git directory was removed or replaced is reopened.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._repos: OrderedDict[Path, tuple[git.Repo, tuple[int, int] | None]] = OrderedDict()
+
+    @staticmethod
+    def _git_dir_id(repo: git.Repo) -> tuple[int, int] | None:
+        try:
+            st = os.stat(repo.git_dir)
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino
+
+    def get(self, repo_path: Path) -> git.Repo:
+        key = repo_path.resolve()
+        entry = self._repos.pop(key, None)
+        if entry is not None and self._git_dir_id(entry[0]) != entry[1]:
+            entry[0].close()
+            entry = None
+        if entry is None:
+            repo = git.Repo(repo_path)
+            entry = (repo, self._git_dir_id(repo))
+
+        self._repos[key] = entry
+        while len(self._repos) > self.max_size:
+            _, (evicted, _) = self._repos.popitem(last=False)
+            evicted.close()
+        return entry[0]
+
+    def discard(self, repo_path: Path) -> None:
+        entry = self._repos.pop(repo_path.resolve(), None)
+        if entry is not None:
+            entry[0].close()
+
+    def close(self) -> None:
+        while self._repos:
+            _, (repo, _) = self._repos.popitem()
+            repo.close()
+
 async def serve(repository: Path | None) -> None:
     logger = logging.getLogger(__name__)
 
@@ -160,6 +208,8 @@ async def serve(repository: Path | None) -> None:
 
     server = Server("mcp-git")
 
+    repos = RepoCache()
+
     @server.list_tools()
     async def list_tools() -> list[Tool]:
         return [
@@ -260,6 +310,8 @@ async def serve(repository: Path | None) -> None:
         
         # Handle git init separately since it doesn't require an existing repo
         if name == GitTools.INIT:
+            # Drop any handle to a repository previously at this path
+            repos.discard(repo_path)
             result = git_init(str(repo_path))
             return [TextContent(
                 type="text",
@@ -267,7 +319,7 @@ async def serve(repository: Path | None) -> None:
             )]
             
         # For all other commands, we need an existing repo
-        repo = git.Repo(repo_path)
+        repo = repos.get(repo_path)
 
         match name:
             case GitTools.STATUS:
@@ -355,5 +407,8 @@ async def serve(repository: Path | None) -> None:
                 raise ValueError(f"Unknown tool: {name}")
 
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        repos.close()
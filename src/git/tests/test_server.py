@@ -1,7 +1,7 @@
 import pytest
 from pathlib import Path
 import git
-from mcp_server_git.server import git_checkout
+from mcp_server_git.server import git_checkout, RepoCache
 import shutil
 
 @pytest.fixture
@@ -27,4 +27,41 @@ def test_git_checkout_existing_branch(test_repository):
 def test_git_checkout_nonexistent_branch(test_repository):
 
     with pytest.raises(git.GitCommandError):
-        git_checkout(test_repository, "nonexistent-branch")
\ No newline at end of file
+        git_checkout(test_repository, "nonexistent-branch")
+
+def test_repo_cache_reuses_handle(test_repository):
+    repo_path = Path(test_repository.working_dir)
+    cache = RepoCache()
+
+    repo = cache.get(repo_path)
+
+    assert cache.get(repo_path / ".") is repo
+    cache.close()
+
+def test_repo_cache_closes_evicted_and_remaining_handles(tmp_path: Path, monkeypatch):
+    cache = RepoCache(max_size=1)
+    closed = []
+
+    def open_repo(name):
+        git.Repo.init(tmp_path / name)
+        repo = cache.get(tmp_path / name)
+        monkeypatch.setattr(repo, "close", lambda: closed.append(repo))
+        return repo
+
+    first = open_repo("first")
+    second = open_repo("second")
+    assert closed == [first]
+
+    cache.close()
+    assert closed == [first, second]
+
+def test_repo_cache_reopens_recreated_repository(test_repository):
+    repo_path = Path(test_repository.working_dir)
+    cache = RepoCache()
+    repo = cache.get(repo_path)
+
+    shutil.rmtree(repo_path)
+    git.Repo.init(repo_path)
+
+    assert cache.get(repo_path) is not repo
+    cache.close()